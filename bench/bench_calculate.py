@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Times the master-mix math in plain Python against a Numba @njit version.
+
+Usage: python bench/bench_calculate.py [-r REPEATS]
+
+Numba is optional; without it only the plain Python timing is reported.
+"""
+import argparse
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pcr_calculator import PCRLogic, _PER_SAMPLE, _calc_cached  # noqa: E402
+
+# Bypass the lru_cache so every call does the arithmetic
+_calc_raw = _calc_cached.__wrapped__
+
+
+def _make_kernel(round_half):
+    """Grand-total kernel mirroring _calc_cached, using the given rounding function."""
+    def totals(n_samples, excess_percent, volumes):
+        factor = 1.0 + (excess_percent / 100.0)
+        grand = 0.0
+        for v in volumes:
+            grand += round_half(v * n_samples * factor)
+        return grand
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PCRLogic.calculate with and without Numba")
+    parser.add_argument("-r", "--repeats", type=int, default=200_000, help="Calls per timing")
+    args = parser.parse_args()
+
+    n, exc, mx = 24, 10.0, 2
+    volumes = tuple(_PER_SAMPLE[mx].values())
+    expected = _calc_raw(n, exc, mx)[1]
+
+    totals_py = _make_kernel(PCRLogic.round_to_half)
+    kernels = {"scalar kernel, Python": totals_py}
+
+    try:
+        from numba import njit
+    except ImportError:
+        print("numba not installed; skipping @njit timing")
+    else:
+        kernels["scalar kernel, @njit"] = njit(_make_kernel(njit(PCRLogic.round_to_half)))
+
+    # Refuse to time kernels that have drifted from calculate (this also compiles the @njit one)
+    for name, kernel in kernels.items():
+        start = time.perf_counter()
+        got = kernel(n, exc, volumes)
+        print(f"{name:<26} first call {time.perf_counter() - start:>8.3f} s")
+        if got != expected:
+            sys.exit(f"{name} returned {got}, calculate returned {expected}")
+
+    timings = {"_calc_cached (uncached)": lambda: _calc_raw(n, exc, mx)}
+    for name, kernel in kernels.items():
+        timings[name] = lambda kernel=kernel: kernel(n, exc, volumes)
+
+    for name, fn in timings.items():
+        secs = timeit.timeit(fn, number=args.repeats)
+        print(f"{name:<26} {secs / args.repeats * 1e9:>8.1f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,12 @@
 #!/usr/bin/env python3
+"""PCR Genotyping Master Mix Calculator (Tkinter GUI and CLI).
+
+Do not @njit `calculate`: it does a few scalar float ops per keystroke, so
+JIT saves well under a microsecond per call while adding a heavy dependency
+and a first-call compile. See bench/bench_calculate.py.
+"""
 import argparse
+import functools
 import sys
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
@@ -10,60 +17,82 @@ PRIMER_PER = 0.5         # Volume of each primer per sample (µL)
 DEFAULT_EXCESS = 10.0    # Default excess percentage
 DEFAULT_SAMPLES = 8
 
+
+def _build_per_sample(mix_x: int) -> dict:
+    """Per-sample volumes (Fixed logic based on 11uL total)."""
+    # Target: Equivalent of 6uL of 2X mix in an 11uL reaction
+    mix_vol = 6.0 * (2.0 / mix_x)
+    primers_total = 2 * PRIMER_PER
+    ddw_vol = PER_SAMPLE_TOTAL - (mix_vol + primers_total)
+
+    if ddw_vol < 0:
+        raise ValueError("Computed DDW volume is negative.")
+
+    return {
+        "DDW": ddw_vol,
+        f"Mix ({mix_x}X)": mix_vol,
+        "Primer Fwd": PRIMER_PER,
+        "Primer Rev": PRIMER_PER,
+    }
+
+
+# Per-sample volumes depend only on the mix concentration; callers must not mutate these
+_PER_SAMPLE = {mx: _build_per_sample(mx) for mx in (2, 5)}
+
+# Static pieces of the text report
+_SEP_EQ = "=" * 50
+_SEP_DASH = "-" * 50
+_HDR = f"{'INGREDIENT':<20} | {'PER SAMPLE':>10} | {'MASTER MIX':>12}"
+_ROW_FMT = "{:<20} | {:>7.1f} µL | {:>9.1f} µL".format
+
 class PCRLogic:
     """Handles the core math for the PCR calculations."""
     
     @staticmethod
     def round_to_half(x: float) -> float:
-        """Rounds a float to the nearest 0.5."""
-        return round(x * 2) / 2.0
+        """Rounds a non-negative float to the nearest 0.5 (halves round up)."""
+        return int(x * 2.0 + 0.5) * 0.5
 
     @staticmethod
     def calculate(n_samples: int, excess_percent: float, mix_x: int):
         """
         Returns a tuple: (per_sample_dict, total_mix_dict, grand_total_vol)
         """
-        if mix_x not in (2, 5):
-            raise ValueError("Mix concentration must be 2 or 5.")
-        
-        # 1. Calculate Per Sample (Fixed logic based on 11uL total)
-        # Target: Equivalent of 6uL of 2X mix in an 11uL reaction
-        mix_vol = 6.0 * (2.0 / mix_x)
-        primers_total = 2 * PRIMER_PER
-        ddw_vol = PER_SAMPLE_TOTAL - (mix_vol + primers_total)
-        
-        if ddw_vol < 0:
-            raise ValueError("Computed DDW volume is negative.")
-
-        per_sample = {
-            "DDW": ddw_vol,
-            f"Mix ({mix_x}X)": mix_vol,
-            "Primer Fwd": PRIMER_PER,
-            "Primer Rev": PRIMER_PER,
-        }
-
-        # 2. Calculate Totals (Master Mix)
-        factor = 1.0 + (excess_percent / 100.0)
-        # We calculate the exact required, then round the final ingredient amount
-        totals = {k: PCRLogic.round_to_half(v * n_samples * factor) for k, v in per_sample.items()}
-        
-        grand_total = sum(totals.values())
-        
-        return per_sample, totals, grand_total
+        # round_to_half assumes non-negative volumes
+        if n_samples < 0:
+            raise ValueError("Number of samples cannot be negative.")
+        if excess_percent < 0:
+            raise ValueError("Excess percentage cannot be negative.")
+
+        try:
+            per_sample = _PER_SAMPLE[mix_x]
+        except KeyError:
+            raise ValueError("Mix concentration must be 2 or 5.") from None
+
+        tot, grand = _calc_cached(n_samples, excess_percent, mix_x)
+        return per_sample, dict(zip(per_sample, tot)), grand
 
     @staticmethod
     def format_text_report(n, exc, mx, per, tot, grand):
-        lines = [
+        return "\n".join([
             f"PCR Report | Samples: {n} | Excess: {exc}% | Mix: {mx}X",
-            "=" * 50,
-            f"{'INGREDIENT':<20} | {'PER SAMPLE':>10} | {'MASTER MIX':>12}",
-            "-" * 50
-        ]
-        for k, v in per.items():
-            lines.append(f"{k:<20} | {v:>7.1f} µL | {tot[k]:>9.1f} µL")
-        lines.append("-" * 50)
-        lines.append(f"{'TOTAL VOLUME':<20} | {PER_SAMPLE_TOTAL:>7.1f} µL | {grand:>9.1f} µL")
-        return "\n".join(lines)
+            _SEP_EQ,
+            _HDR,
+            _SEP_DASH,
+            *(_ROW_FMT(k, v, tot[k]) for k, v in per.items()),
+            _SEP_DASH,
+            _ROW_FMT("TOTAL VOLUME", PER_SAMPLE_TOTAL, grand),
+        ])
+
+
+@functools.lru_cache(maxsize=4096)
+def _calc_cached(n_samples, excess_percent, mix_x):
+    """Cached core of PCRLogic.calculate; returns (totals_tuple, grand_total)."""
+    # Calculate Totals (Master Mix)
+    factor = 1.0 + (excess_percent / 100.0)
+    # We calculate the exact required, then round the final ingredient amount
+    totals = tuple(PCRLogic.round_to_half(v * n_samples * factor) for v in _PER_SAMPLE[mix_x].values())
+    return totals, sum(totals)
 
 
 class PCRGui:
@@ -110,19 +139,28 @@ class PCRGui:
         input_frame = ttk.LabelFrame(main_frame, text="Configuration", padding=15)
         input_frame.pack(fill="x", pady=(0, 20))
 
+        # Reject non-numeric keystrokes up front so the Tk variables always parse
+        vcmd_int = (self.root.register(self._validate_int), '%P')
+        vcmd_float = (self.root.register(self._validate_float), '%P')
+
         # Samples Row
         ttk.Label(input_frame, text="Samples:").grid(row=0, column=0, sticky="w")
-        self.spin_samples = ttk.Spinbox(input_frame, from_=1, to=999, textvariable=self.var_samples, width=6)
+        self.spin_samples = ttk.Spinbox(input_frame, from_=1, to=999, textvariable=self.var_samples, width=6,
+                                        validate="key", validatecommand=vcmd_int)
         self.spin_samples.grid(row=0, column=1, padx=10, sticky="w")
         
         # Slider for samples (Quick adjust)
-        self.scale_samples = ttk.Scale(input_frame, from_=1, to=96, variable=self.var_samples, orient="horizontal")
+        # Snap to whole samples so the Spinbox never shows (and rejects edits to) float text
+        self.scale_samples = ttk.Scale(input_frame, from_=1, to=96, variable=self.var_samples, orient="horizontal",
+                                       command=lambda v: self.var_samples.set(round(float(v))))
         self.scale_samples.grid(row=0, column=2, sticky="ew", padx=10)
         input_frame.columnconfigure(2, weight=1)
 
         # Excess Row
         ttk.Label(input_frame, text="Excess (%):").grid(row=1, column=0, sticky="w", pady=10)
-        ttk.Spinbox(input_frame, from_=0, to=50, increment=0.5, textvariable=self.var_excess, width=6).grid(row=1, column=1, padx=10, sticky="w", pady=10)
+        self.spin_excess = ttk.Spinbox(input_frame, from_=0, to=50, increment=0.5, textvariable=self.var_excess, width=6,
+                                       validate="key", validatecommand=vcmd_float)
+        self.spin_excess.grid(row=1, column=1, padx=10, sticky="w", pady=10)
 
         # Mix Row
         ttk.Label(input_frame, text="Mix Type:").grid(row=2, column=0, sticky="w")
@@ -142,6 +180,10 @@ class PCRGui:
         
         self.tree.pack(fill="both", expand=True)
 
+        # Rows are fixed, so allocate them once and update values in place
+        self._row_iids = {k: self.tree.insert("", "end", iid=k, values=(k, "", ""))
+                          for k in ("DDW", "Mix", "Primer Fwd", "Primer Rev")}
+
         # --- Section 3: Grand Total Highlight ---
         total_frame = ttk.Frame(main_frame, padding=(0, 20, 0, 10))
         total_frame.pack(fill="x")
@@ -160,26 +202,44 @@ class PCRGui:
         ttk.Button(btn_frame, text="Copy to Clipboard", command=self.copy_to_clipboard).pack(side="left", fill="x", expand=True, padx=(0, 5))
         ttk.Button(btn_frame, text="Save Report", command=self.save_report).pack(side="left", fill="x", expand=True, padx=(5, 0))
 
+    @staticmethod
+    def _validate_int(s):
+        # Tcl reads a leading 0 as octal, so "08" would be unparseable
+        return s == "" or (s.isascii() and s.isdigit() and (s == "0" or not s.startswith("0")))
+
+    @staticmethod
+    def _validate_float(s):
+        if s in ("", "."):
+            return True
+        if s.startswith("0") and s[1:2] not in ("", "."):
+            return False
+        return s.isascii() and s.count(".") <= 1 and s.replace(".", "").isdigit()
+
     def get_inputs(self):
-        try:
-            n = self.var_samples.get()
-            e = self.var_excess.get()
-            m_str = self.var_mix.get().replace("X", "")
-            m = int(m_str)
-            if n < 1: raise ValueError("Samples < 1")
-            if e < 0: raise ValueError("Excess < 0")
-            return n, e, m
-        except Exception:
+        s_str = self.spin_samples.get()
+        e_str = self.spin_excess.get()
+        # Partially typed fields (empty, or a lone ".") have nothing to compute yet
+        if s_str == "" or e_str in ("", "."):
             return None
 
+        # Parse the widget text in Python (always decimal) rather than via Tcl
+        n = int(s_str)
+        e = float(e_str)
+        m = int(self.var_mix.get().replace("X", ""))
+        if n < 1 or e < 0:
+            return None
+        return n, e, m
+
     def update_calc(self, *args):
+        # Coalesce bursts of trace callbacks (e.g. slider drags) into one recompute
+        self._pending = getattr(self, '_pending', None) or self.root.after_idle(self._do_update)
+
+    def _do_update(self):
+        self._pending = None
         inputs = self.get_inputs()
-        
-        # Clear previous results
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-            
+
         if not inputs:
+            self._clear_rows()
             self.lbl_grand_total.config(text="Invalid Input", foreground="red")
             self.lbl_status.config(text="Please check your input values.")
             return
@@ -188,29 +248,34 @@ class PCRGui:
         try:
             per, tot, grand = PCRLogic.calculate(n, exc, mx)
             
-            # Populate Table
-            for k in per.keys():
-                # Highlight rows differently if needed, or just insert
-                self.tree.insert("", "end", values=(k, f"{per[k]:.1f}", f"{tot[k]:.1f}"))
+            # Populate Table (the Mix label carries the current concentration)
+            for iid, k in zip(self._row_iids.values(), per):
+                self.tree.item(iid, values=(k, f"{per[k]:.1f}", f"{tot[k]:.1f}"))
             
             # Update Grand Total
             self.lbl_grand_total.config(text=f"{grand:.1f} µL", foreground="#0055aa")
             self.lbl_status.config(text="") # Clear errors
             
-            # Store current results for export
-            self.current_report = PCRLogic.format_text_report(n, exc, mx, per, tot, grand)
+            # Store raw results; the report is formatted on export
+            self._last_result = (n, exc, mx, per, tot, grand)
             
         except ValueError as e:
+            self._clear_rows()
             self.lbl_status.config(text=str(e))
 
+    def _clear_rows(self):
+        for iid in self._row_iids.values():
+            self.tree.item(iid, values=(iid, "", ""))
+
     def copy_to_clipboard(self):
-        if hasattr(self, 'current_report'):
+        if hasattr(self, '_last_result'):
             self.root.clipboard_clear()
-            self.root.clipboard_append(self.current_report)
+            self.root.clipboard_append(PCRLogic.format_text_report(*self._last_result))
             messagebox.showinfo("Copied", "Report copied to clipboard!")
 
     def save_report(self):
-        if not hasattr(self, 'current_report'): return
+        if not hasattr(self, '_last_result'): return
+        report = PCRLogic.format_text_report(*self._last_result)
         
         path = self.save_path
         if not path:
@@ -223,7 +288,7 @@ class PCRGui:
         if path:
             try:
                 with open(path, "w") as f:
-                    f.write(self.current_report)
+                    f.write(report)
                 messagebox.showinfo("Saved", f"Saved to {path}")
             except Exception as e:
                 messagebox.showerror("Error", f"Could not save file:\n{e}")